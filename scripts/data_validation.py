@@ -2,36 +2,53 @@
 from __future__ import annotations
 
 import csv
+import os
 import sqlite3
 import sys
+import tempfile
+from contextlib import suppress
 from datetime import datetime, date, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from statistics import pstdev, mean
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-RUN_TIMESTAMP = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-
+import numpy as np
+import pandas as pd
 
-def load_fact_campaigns(db_path: str) -> List[Dict[str, Any]]:
+RUN_TIMESTAMP = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+FETCH_CHUNK_SIZE = 10_000
+MISSING_TAXONOMY_VALUES = frozenset({"", "unknown"})
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+)
+
+
+def load_fact_campaigns(db_path: str) -> pd.DataFrame:
     """Load the fact_campaigns table from the SQLite database."""
     with sqlite3.connect(db_path) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute("SELECT * FROM fact_campaigns")
-        rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+        # Nullable dtypes keep integer IDs as Int64 when some values are NULL.
+        chunks = pd.read_sql_query(
+            "SELECT * FROM fact_campaigns",
+            conn,
+            chunksize=FETCH_CHUNK_SIZE,
+            dtype_backend="numpy_nullable",
+        )
+        return pd.concat(chunks, ignore_index=True)
 
 
-def is_missing_value(value: Any) -> bool:
-    """Return True if the value should be treated as missing taxonomy."""
-    if value is None:
-        return True
-    if isinstance(value, str):
-        stripped = value.strip()
-        if stripped == "":
-            return True
-        if stripped.lower() == "unknown":
-            return True
-    return False
+def missing_taxonomy_mask(values: pd.Series) -> pd.Series:
+    """Return a boolean mask of values that should be treated as missing taxonomy."""
+    # Taxonomy columns have few distinct values, so normalize the categories
+    # once and match rows by their integer codes.
+    categorical = values.astype("category")
+    categories = categorical.cat.categories.astype("string").str.strip().str.lower()
+    missing_codes = np.flatnonzero(categories.isin(MISSING_TAXONOMY_VALUES))
+    return values.isna() | categorical.cat.codes.isin(missing_codes)
 
 
 def build_sample_rows(records: Iterable[Dict[str, Any]], limit: int = 5) -> str:
@@ -39,12 +56,12 @@ def build_sample_rows(records: Iterable[Dict[str, Any]], limit: int = 5) -> str:
     preferred_id_cols = ["campaign_id", "ad_id", "ad_group_id", "id"]
     samples: List[str] = []
 
-    for record in list(records)[:limit]:
+    for record in islice(records, limit):
         parts: List[str] = []
         for column in preferred_id_cols:
-            if column in record and record[column] is not None:
+            if column in record and not pd.isna(record[column]):
                 parts.append(f"{column}={record[column]}")
-        if "date" in record and record["date"] is not None:
+        if "date" in record and not pd.isna(record["date"]):
             parts.append(f"date={record['date']}")
         if not parts:
             parts.append(str({k: record[k] for k in sorted(record.keys())}))
@@ -53,82 +70,93 @@ def build_sample_rows(records: Iterable[Dict[str, Any]], limit: int = 5) -> str:
     return "; ".join(samples)
 
 
-def taxonomy_validation(data: Sequence[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+def taxonomy_validation(data: pd.DataFrame) -> Tuple[int, List[Dict[str, Any]]]:
     """Check for missing taxonomy in source or medium columns."""
-    if not data:
+    if data.empty:
         return 0, []
 
-    sample_record = data[0]
-    if "source" not in sample_record or "medium" not in sample_record:
-        return len(data), list(data[:5])
-
-    flagged: List[Dict[str, Any]] = []
-    for record in data:
-        if is_missing_value(record.get("source")) or is_missing_value(record.get("medium")):
-            flagged.append(record)
-
-    return len(flagged), flagged
+    if "source" not in data.columns or "medium" not in data.columns:
+        return len(data), data.head(5).to_dict("records")
 
+    mask = missing_taxonomy_mask(data["source"]) | missing_taxonomy_mask(data["medium"])
+    return int(mask.sum()), data[mask].head(5).to_dict("records")
 
-def coerce_float(value: Any) -> Optional[float]:
-    try:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-        text = str(value).strip()
-        if text == "":
-            return None
-        return float(text)
-    except (TypeError, ValueError):
-        return None
 
-
-def outlier_validation(data: Sequence[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+def outlier_validation(data: pd.DataFrame) -> Tuple[int, List[Dict[str, Any]]]:
     """Detect outliers based on Z-score for key numeric metrics."""
     metrics = ["spend", "impressions", "clicks", "conversions", "revenue"]
-    if not data:
+    if data.empty:
         return 0, []
 
-    flagged_indices: set[int] = set()
-    for metric in metrics:
-        values_with_index: List[Tuple[int, float]] = []
-        for idx, record in enumerate(data):
-            numeric_value = coerce_float(record.get(metric))
-            if numeric_value is not None:
-                values_with_index.append((idx, numeric_value))
+    present = [metric for metric in metrics if metric in data.columns]
+    values = (
+        data[present]
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy(dtype=np.float64, na_value=np.nan)
+    )
 
-        if len(values_with_index) < 2:
-            continue
+    # Metrics need at least two observed values for a meaningful Z-score.
+    values = values[:, np.count_nonzero(~np.isnan(values), axis=0) >= 2]
+    if values.shape[1] == 0:
+        return 0, []
 
-        values = [val for _, val in values_with_index]
-        avg = mean(values)
-        std_dev = pstdev(values)
-        if std_dev == 0:
-            continue
+    # Center once and reuse the deviations for both the variance and the
+    # outlier test; this keeps the variance numerically stable for skewed metrics.
+    deviations = values - np.nanmean(values, axis=0)
+    std_dev = np.sqrt(np.nanmean(np.square(deviations), axis=0))
+    std_dev[std_dev == 0] = np.nan
+
+    # |x - mean| / std >= 3 is tested as |x - mean| >= 3 * std, which avoids
+    # dividing every element of the matrix.
+    np.abs(deviations, out=deviations)
+    flagged = np.any(deviations >= 3 * std_dev, axis=1)
 
-        for idx, value in values_with_index:
-            z_score = (value - avg) / std_dev
-            if abs(z_score) >= 3:
-                flagged_indices.add(idx)
+    return int(flagged.sum()), data[flagged].head(5).to_dict("records")
 
-    flagged_records = [data[idx] for idx in sorted(flagged_indices)]
-    return len(flagged_records), flagged_records
 
+def detect_date_format(values: Iterable[Any]) -> Optional[str]:
+    """Return the entry of ``DATE_FORMATS`` matching the first non-empty date string."""
+    for value in values:
+        if isinstance(value, date) or pd.isna(value):
+            continue
+        text = str(value).strip()
+        if text == "":
+            continue
+        for fmt in DATE_FORMATS:
+            try:
+                datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            return fmt
+        return None
+    return None
 
-def parse_date(value: Any) -> Optional[date]:
+
+def parse_date(value: Any, date_format: Optional[str] = None) -> Optional[date]:
     if value is None:
         return None
     if isinstance(value, datetime):
         return value.date()
     if isinstance(value, date):
         return value
+    return _parse_date_text(str(value).strip(), date_format)
+
 
-    text = str(value).strip()
+@lru_cache(maxsize=4096)
+def _parse_date_text(text: str, date_format: Optional[str] = None) -> Optional[date]:
+    """Parse a date string; cached because dates repeat heavily across rows."""
     if text == "":
         return None
 
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"):
+    if date_format is not None:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+
+    for fmt in DATE_FORMATS:
+        if fmt == date_format:
+            continue
         try:
             return datetime.strptime(text, fmt).date()
         except ValueError:
@@ -140,32 +168,43 @@ def parse_date(value: Any) -> Optional[date]:
         return None
 
 
-def latency_validation(data: Sequence[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+def latency_validation(data: pd.DataFrame) -> Tuple[int, List[Dict[str, Any]]]:
     """Check if the latest date in the data is older than three days."""
-    if not data:
+    if data.empty:
         return 1, []
 
-    if "date" not in data[0]:
-        return 1, list(data[:1])
-
-    latest_date: Optional[date] = None
-    latest_index: Optional[int] = None
-    for idx, record in enumerate(data):
-        parsed = parse_date(record.get("date"))
-        if parsed is None:
-            continue
-        if latest_date is None or parsed > latest_date:
-            latest_date = parsed
-            latest_index = idx
-
-    if latest_date is None:
-        return 1, list(data[:1])
-
-    today = datetime.now(timezone.utc).date()
+    if "date" not in data.columns:
+        return 1, data.head(1).to_dict("records")
+
+    # Rows almost always share one format, so probe it once and parse the
+    # column in bulk; only values in another format fall back to parse_date.
+    # Without a detected format, every value goes through parse_date so that
+    # pandas never guesses formats the validator does not accept.
+    raw_dates = data["date"]
+    date_format = detect_date_format(raw_dates)
+    if date_format is not None or pd.api.types.is_datetime64_any_dtype(raw_dates):
+        # Parse as UTC and drop the zone so offset-qualified ISO strings
+        # compare with naive ones and with today's date.
+        dates = pd.to_datetime(
+            raw_dates, format=date_format, errors="coerce", cache=True, utc=True
+        ).dt.tz_localize(None)
+    else:
+        dates = pd.Series(pd.NaT, index=raw_dates.index, dtype="datetime64[ns]")
+    unparsed = dates.isna() & raw_dates.notna()
+    if unparsed.any():
+        fallback = raw_dates[unparsed].map(lambda value: parse_date(value, date_format))
+        dates[unparsed] = pd.to_datetime(
+            fallback, errors="coerce", utc=True
+        ).dt.tz_localize(None)
+
+    dates = dates.dt.normalize()
+    if dates.isna().all():
+        return 1, data.head(1).to_dict("records")
+
+    latest_date = dates.max()
+    today = pd.Timestamp(datetime.now(timezone.utc).date())
     if (today - latest_date).days > 3:
-        if latest_index is not None:
-            return 1, [data[latest_index]]
-        return 1, []
+        return 1, data.loc[[dates.idxmax()]].to_dict("records")
 
     return 0, []
 
@@ -178,8 +217,72 @@ def write_results(output_path: str, results: Sequence[Dict[str, Any]]) -> None:
     with output_file.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
         writer.writeheader()
-        for result in results:
-            writer.writerow(result)
+        writer.writerows(results)
+
+
+def results_cache_path(db_path: str) -> Optional[Path]:
+    """Return the cache file for results of the database in its current state.
+
+    Each database gets its own directory under ``.cache``. The file name
+    combines the database's mtime and size with today's UTC date, because the
+    latency check depends on the current day. Returns ``None`` when the
+    database file does not exist.
+    """
+    db_file = Path(db_path)
+    try:
+        stat = db_file.stat()
+    except OSError:
+        return None
+    today = datetime.now(timezone.utc).date().isoformat()
+    key = f"{stat.st_mtime_ns}-{stat.st_size}-{today}"
+    return db_file.parent / ".cache" / db_file.name / f"{key}.csv"
+
+
+def read_cached_results(cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Load cached result rows, restamped with the current run timestamp.
+
+    Returns ``None`` on a cache miss, including when the entry cannot be read
+    or is not a complete results file.
+    """
+    try:
+        with cache_path.open(newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            rows = list(reader)
+            fieldnames = reader.fieldnames or []
+    except (OSError, csv.Error):
+        return None
+
+    if not {"rule", "severity"}.issubset(fieldnames):
+        return None
+    if any(not row["rule"] or not row["severity"] for row in rows):
+        return None
+    return [{**row, "run_timestamp": RUN_TIMESTAMP} for row in rows]
+
+
+def store_cached_results(cache_path: Path, results: Sequence[Dict[str, Any]]) -> None:
+    """Replace the database's cache entry; caching is best-effort.
+
+    The entry is written to a temporary file and renamed into place, so an
+    interrupted write never leaves a truncated file under the live key.
+    """
+    temp_path: Optional[str] = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        os.close(fd)
+        write_results(temp_path, results)
+        os.replace(temp_path, cache_path)
+        temp_path = None
+
+        # Keep only the entry for the current state of this database.
+        for stale in cache_path.parent.glob("*.csv"):
+            if stale != cache_path:
+                stale.unlink()
+    except OSError:
+        # An unwritable cache must not fail a validation run.
+        if temp_path is not None:
+            with suppress(OSError):
+                os.unlink(temp_path)
 
 
 def run_validations(db_path: str, output_path: str) -> bool:
@@ -187,6 +290,12 @@ def run_validations(db_path: str, output_path: str) -> bool:
 
     Returns ``True`` if any critical findings were detected.
     """
+    cache_path = results_cache_path(db_path)
+    cached = read_cached_results(cache_path) if cache_path is not None else None
+    if cached is not None:
+        write_results(output_path, cached)
+        return any(result["severity"] == "critical" for result in cached)
+
     results: List[Dict[str, Any]] = []
     critical_found = False
 
@@ -203,6 +312,7 @@ def run_validations(db_path: str, output_path: str) -> bool:
             }
         )
         critical_found = True
+        cache_path = None
     except Exception as exc:
         results.append(
             {
@@ -214,6 +324,7 @@ def run_validations(db_path: str, output_path: str) -> bool:
             }
         )
         critical_found = True
+        cache_path = None
     else:
         tax_count, tax_records = taxonomy_validation(data)
         if tax_count > 0:
@@ -259,6 +370,8 @@ def run_validations(db_path: str, output_path: str) -> bool:
             critical_found = True
 
     write_results(output_path, results)
+    if cache_path is not None:
+        store_cached_results(cache_path, results)
     return critical_found
 
 
@@ -15,15 +15,43 @@ RAW_CSV_PATH = DATA_DIR / "sample_marketing_data.csv"
 CLEAN_CSV_PATH = DATA_DIR / "sample_marketing_data_clean.csv"
 SQLITE_DB_PATH = DATA_DIR / "marketing.db"
 TABLE_NAME = "fact_campaigns"
+WRITE_CHUNK_SIZE = 10_000
+PRIMARY_KEY_COLUMNS = ["campaign_id", "date", "source", "medium"]
+COLUMN_DTYPES = {
+    "campaign_id": "Int64",
+    "campaign_name": "string",
+    "source": "string",
+    "medium": "string",
+    "spend": "Float64",
+    "impressions": "Int64",
+    "clicks": "Int64",
+    "conversions": "Int64",
+    "revenue": "Float64",
+}
+# Used when a column's values do not fit its COLUMN_DTYPES entry: campaign IDs
+# may be alphanumeric, and count metrics may arrive with fractional values.
+COLUMN_FALLBACK_DTYPES = {
+    "campaign_id": "string",
+    "impressions": "Float64",
+    "clicks": "Float64",
+    "conversions": "Float64",
+}
+
+_RE_SEPARATORS = re.compile(r"[\s\-]+")
+# Zero-width camelCase word boundaries, matched in a single scan.
+_RE_CAMEL = re.compile(r"(?<=.)(?=[A-Z][a-z])|(?<=[a-z0-9])(?=[A-Z])")
+_RE_NON_WORD = re.compile(r"[^0-9a-zA-Z_]+")
 
 
 def to_snake_case(name: str) -> str:
     """Convert a column name to snake_case."""
     name = name.strip()
-    name = re.sub(r"[\s\-]+", "_", name)
-    name = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
-    name = re.sub(r"[^0-9a-zA-Z_]+", "", name)
+    if name.isascii() and name.isidentifier() and name.islower():
+        # Already snake_case; the substitutions below would be no-ops.
+        return name
+    name = _RE_SEPARATORS.sub("_", name)
+    name = _RE_CAMEL.sub("_", name)
+    name = _RE_NON_WORD.sub("", name)
     return name.lower()
 
 
@@ -36,15 +64,54 @@ def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
 def trim_string_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Trim whitespace from string-like columns."""
     string_cols = df.select_dtypes(include=["object", "string"]).columns
-    for col in string_cols:
-        df[col] = df[col].astype("string").str.strip()
-        df[col] = df[col].replace({"": pd.NA})
+    if not string_cols.empty:
+        df[string_cols] = df[string_cols].apply(_strip_to_na)
     return df
 
 
+def _strip_to_na(values: pd.Series) -> pd.Series:
+    """Strip whitespace and turn the resulting empty strings into missing values."""
+    stripped = values.astype("string").str.strip()
+    return stripped.mask(stripped == "")
+
+
 def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
-    """Coerce column types where possible."""
-    return df.convert_dtypes()
+    """Cast schema columns to their declared dtypes.
+
+    Numeric columns are parsed with ``errors="coerce"``. A column whose values
+    do not fit its declared dtype uses its ``COLUMN_FALLBACK_DTYPES`` entry;
+    a ``"string"`` fallback keeps the original values rather than coercing
+    them. Values coerced to missing are reported on stderr. Columns outside
+    the schema keep their loaded dtype.
+    """
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if dtype == "string":
+            df[col] = values.astype("string")
+            continue
+
+        fallback = COLUMN_FALLBACK_DTYPES.get(col)
+        numeric = pd.to_numeric(values, errors="coerce")
+        coerced = int((numeric.isna() & values.notna()).sum())
+        if coerced and fallback == "string":
+            df[col] = values.astype("string")
+            continue
+
+        try:
+            df[col] = numeric.astype(dtype)
+        except (TypeError, ValueError):
+            if fallback is None:
+                raise
+            df[col] = numeric.astype(fallback)
+
+        if coerced:
+            print(
+                f"Coerced {coerced} non-numeric value(s) in '{col}' to missing.",
+                file=sys.stderr,
+            )
+    return df
 
 
 def ensure_non_negative(df: pd.DataFrame) -> pd.DataFrame:
@@ -61,10 +128,11 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df = trim_string_columns(df)
     df = coerce_types(df)
 
-    # Fill missing categorical values
+    # Fill missing categorical values; the low-cardinality taxonomy columns
+    # are stored as categories so grouping and matching work on codes.
     for col in ("medium", "source"):
         if col in df.columns:
-            df[col] = df[col].fillna("unknown")
+            df[col] = df[col].fillna("unknown").astype("category")
 
     # Cast date column to datetime when present
     if "date" in df.columns:
@@ -72,8 +140,10 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
     df = ensure_non_negative(df)
 
-    # Drop duplicate records
-    df = df.drop_duplicates()
+    # Drop duplicate records by primary key; a partial key would merge
+    # distinct campaigns, so compare whole rows unless every key column exists
+    has_key = set(PRIMARY_KEY_COLUMNS).issubset(df.columns)
+    df = df.drop_duplicates(subset=PRIMARY_KEY_COLUMNS if has_key else None)
 
     return df
 
@@ -84,7 +154,7 @@ def summarize(df: pd.DataFrame) -> pd.DataFrame:
     if not required_cols.issubset(df.columns):
         return pd.DataFrame()
     summary = (
-        df.groupby(["source", "medium"], dropna=False)
+        df.groupby(["source", "medium"], dropna=False, observed=True)
         .size()
         .reset_index(name="row_count")
         .sort_values(["row_count", "source", "medium"], ascending=[False, True, True])
@@ -97,12 +167,26 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"Input CSV not found at {csv_path}")
     try:
-        df = pd.read_csv(csv_path)
+        df = read_csv_columns(csv_path)
     except pd.errors.EmptyDataError:
         return pd.DataFrame()
     return df
 
 
+def read_csv_columns(csv_path: Path) -> pd.DataFrame:
+    """Read a CSV into Arrow-backed columns, falling back to the C engine.
+
+    No dtypes are forced here: headers are not standardized yet, so casting to
+    the known schema is left to ``clean_dataframe``.
+    """
+    try:
+        return pd.read_csv(csv_path, engine="pyarrow", dtype_backend="pyarrow")
+    except (ImportError, ValueError):
+        # PyArrow is optional; the C engine also reports empty files as
+        # EmptyDataError, which the PyArrow engine does not.
+        return pd.read_csv(csv_path)
+
+
 def write_outputs(df: pd.DataFrame) -> None:
     """Persist cleaned data to SQLite and CSV."""
     CLEAN_CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -115,7 +199,15 @@ def write_outputs(df: pd.DataFrame) -> None:
 
     engine = create_engine(f"sqlite:///{SQLITE_DB_PATH}")
     with engine.begin() as connection:
-        df.to_sql(TABLE_NAME, connection, if_exists="replace", index=False)
+        # Default executemany inserts inside one transaction; method="multi"
+        # is far slower on SQLite because of its bound-parameter limit.
+        df.to_sql(
+            TABLE_NAME,
+            connection,
+            if_exists="replace",
+            index=False,
+            chunksize=WRITE_CHUNK_SIZE,
+        )
 
 
 def print_summary(raw_count: int, cleaned_df: pd.DataFrame) -> None: